@@ -1,3 +1,4 @@
+from functools import cached_property
 from typing import Dict, List, Optional, Union
 
 from pydantic import BaseModel, Field, field_validator, model_validator
@@ -46,6 +47,11 @@ class Book(BaseModel):
             self.bookmark_count = actual_count
         return self
 
+    @cached_property
+    def icon(self) -> Dict:
+        """Notion page icon pointing at the book cover"""
+        return {"type": "external", "external": {"url": self.cover}}
+
     class Config:
         """Pydantic配置"""
 
@@ -1,70 +1,67 @@
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from book import Book
+from constants import REQUIRED_BOOK_KEYS
 from weread import WeReadClient
 
 logger = logging.getLogger(__name__)
 
 
+def _bookmark_sort_key(bookmark: Dict) -> Tuple[int, int]:
+    """Orders bookmarks by chapter, then by start offset within the chapter."""
+    start = bookmark.get("range", "0-0").partition("-")[0]
+    # A malformed range sorts first in its chapter instead of failing the build
+    return bookmark.get("chapterUid", 1), int(start) if start.isdecimal() else 0
+
+
 class BookBuilder:
+    """Builds Book objects from WeRead data.
+
+    The builder keeps no per-build state, so a single instance can build
+    several books concurrently.
+    """
+
     def __init__(self, client: WeReadClient):
         # Initialize only with the client
         self.client = client
-        # Internal state for fetched data, reset per build
-        self._info: Optional[Dict] = None
-        self._reviews_raw: Optional[List[Dict]] = None
-        self._bookmarks_raw: Optional[List[Dict]] = None
-        self._chapters_raw: Optional[List[Dict]] = None
-        self._read_info: Optional[Dict] = None
-        # The book object being built, specific to a single build call
-        self.book: Optional[Book] = None
 
     def build(self, data: dict) -> Optional[Book]:
         """Constructs the book object with fetched data."""
-        self._reset()  # Reset state before starting
-
-        self.book = self._create_book_from_json(data)
-        if not self.book:
+        book = self._create_book_from_json(data)
+        if not book:
             # Error logged in _create_book_from_json if bookId is missing
             return None
 
         try:
-            self._build_steps()  # Execute the build sequence
-            final_book = self.book
+            # Execute the build sequence
+            self._build_steps(book, data.get("book", data))
         except Exception as e:
-            logger.error(f"Error during build steps for book {self.book.bookId}: {e}")
-            final_book = None
-        finally:
-            # Ensure self.book is cleared even if build steps succeed
-            # The final book object is held in final_book
-            self.book = None
-
-        return final_book
-
-    def _reset(self) -> None:
-        """Resets the internal state of the builder for a new build."""
-        self._info = None
-        self._reviews_raw = None
-        self._bookmarks_raw = None
-        self._chapters_raw = None
-        self._read_info = None
-        self.book = None
-
-    def _build_steps(self) -> None:
+            logger.error(f"Error during build steps for book {book.bookId}: {e}")
+            return None
+
+        return book
+
+    def _build_steps(self, book: Book, book_data: Dict) -> None:
         """Executes the core fetching and processing steps for building the book."""
-        if not self.book or not self.book.bookId:
+        if not book.bookId:
             logger.error("Attempted build steps without a valid base book.")
             raise ValueError(
                 "Cannot execute build steps without a valid book instance."
             )
 
-        self._fetch_all()
-        self._process_book_info()
-        self._process_reviews()
-        self._process_bookmarks()
-        self._process_chapters()
-        self._process_read_info()
+        # Skip the book info request when the notebook entry already has the
+        # fields _process_book_info reads
+        has_book_info = REQUIRED_BOOK_KEYS <= book_data.keys()
+        # TODO: check where went wrong with reviews fetching
+        bundle = self.client.get_book_bundle(
+            book.bookId, include_reviews=False, include_info=not has_book_info
+        )
+        self._process_book_info(book, book_data if has_book_info else bundle["info"])
+        self._process_reviews(book, bundle.get("reviews"))
+        self._process_bookmarks(book, bundle["bookmarks"])
+        self._process_chapters(book, bundle["chapters"])
+        self._process_read_info(book, bundle["read_info"])
 
     def _create_book_from_json(self, data: dict) -> Optional[Book]:
         """Creates a base Book object from JSON data."""
@@ -93,98 +90,45 @@ class BookBuilder:
             category=category,
         )
 
-    def _fetch_book_info(self) -> "BookBuilder":
-        if self.book and self.book.bookId:
-            self._info = self.client.get_bookinfo(self.book.bookId)
-        return self
-
-    def _fetch_reviews(self) -> "BookBuilder":
-        if self.book and self.book.bookId:
-            # TODO: check where went wrong with reviews fetching
-            # self._reviews_raw = self.client.get_reviews(self.book.bookId)
-            pass  # Keep commented out until fixed
-        return self
-
-    def _fetch_bookmarks(self) -> "BookBuilder":
-        if self.book and self.book.bookId:
-            self._bookmarks_raw = self.client.get_bookmarks(self.book.bookId)
-        return self
-
-    def _fetch_chapters(self) -> "BookBuilder":
-        if self.book and self.book.bookId:
-            self._chapters_raw = self.client.get_chapters(self.book.bookId)
-        return self
-
-    def _fetch_read_info(self) -> "BookBuilder":
-        if self.book and self.book.bookId:
-            self._read_info = self.client.get_readinfo(self.book.bookId)
-        return self
-
-    def _fetch_all(self) -> "BookBuilder":
-        # Ensure book exists before fetching
-        if not self.book or not self.book.bookId:
-            logger.error(
-                "Cannot fetch data without a valid book instance during fetch_all."
-            )
-            # Optionally raise an error or just return self
-            return self  # Return self to maintain chainability, but log the error
-        self._fetch_book_info()
-        self._fetch_reviews()
-        self._fetch_bookmarks()
-        self._fetch_chapters()
-        self._fetch_read_info()
-        return self
-
-    def _process_book_info(self):
-        if self.book and self._info:
-            self.book.isbn = self._info.get("isbn", "")
-            self.book.rating = self._info.get("newRating", 0) / 1000
-
-    def _process_reviews(self):
-        if self.book and self._reviews_raw:
-            reviews_list = self._reviews_raw
-            self.book.summary = list(
-                filter(lambda x: x.get("review", {}).get("type") == 4, reviews_list)
-            )
-            self.book.reviews = list(
-                filter(lambda x: x.get("review", {}).get("type") == 1, reviews_list)
-            )
-            self.book.reviews = list(map(lambda x: x.get("review"), self.book.reviews))
-            self.book.reviews = list(
-                map(
-                    lambda x: {**x, "markText": x.pop("content", "")}, self.book.reviews
-                )
-            )
-
-    def _process_bookmarks(self):
-        if self.book and self._bookmarks_raw:
-            updated = self._bookmarks_raw
-            self.book.bookmark_list = sorted(
-                updated,
-                key=lambda x: (
-                    x.get("chapterUid", 1),
-                    int(x.get("range", "0-0").split("-")[0]),
-                ),
-            )
-            self.book.bookmark_count = len(self.book.bookmark_list)
-
-    def _process_chapters(self):
-        if self.book and self._chapters_raw:
-            chapters_list = self._chapters_raw
-            self.book.chapters = {
-                chapter.get("chapterUid"): chapter
+    @staticmethod
+    def _process_book_info(book: Book, info: Optional[Dict]) -> None:
+        if info:
+            book.isbn = info.get("isbn", "")
+            book.rating = info.get("newRating", 0) / 1000
+
+    @staticmethod
+    def _process_reviews(book: Book, reviews_list: Optional[List[Dict]]) -> None:
+        if reviews_list:
+            book.summary = [
+                x for x in reviews_list if x.get("review", {}).get("type") == 4
+            ]
+            book.reviews = [
+                {**review, "markText": review.pop("content", "")}
+                for x in reviews_list
+                if (review := x.get("review", {})).get("type") == 1
+            ]
+
+    @staticmethod
+    def _process_bookmarks(book: Book, updated: Optional[List[Dict]]) -> None:
+        if updated:
+            book.bookmark_list = sorted(updated, key=_bookmark_sort_key)
+            book.bookmark_count = len(book.bookmark_list)
+
+    @staticmethod
+    def _process_chapters(book: Book, chapters_list: Optional[List[Dict]]) -> None:
+        if chapters_list:
+            book.chapters = {
+                chapter_uid: chapter
                 for chapter in chapters_list
-                if chapter.get("chapterUid") is not None
+                if (chapter_uid := chapter.get("chapterUid")) is not None
             }
-            if not self.book.chapters:
-                logger.warning(
-                    f"No valid chapter data found for book {self.book.bookId}."
-                )
-
-    def _process_read_info(self):
-        if self.book and self._read_info:
-            data = self._read_info
+            if not book.chapters:
+                logger.warning(f"No valid chapter data found for book {book.bookId}.")
+
+    @staticmethod
+    def _process_read_info(book: Book, data: Optional[Dict]) -> None:
+        if data:
             marked_status = data.get("markedStatus", 0)
-            self.book.status = "读完" if marked_status == 4 else "在读"
-            self.book.reading_time = data.get("readingTime", 0)
-            self.book.finished_date = data.get("finishedDate")
+            book.status = "读完" if marked_status == 4 else "在读"
+            book.reading_time = data.get("readingTime", 0)
+            book.finished_date = data.get("finishedDate")
@@ -1,12 +1,10 @@
 WEREAD_URL = "https://weread.qq.com/"
 WEREAD_NOTEBOOKS_URL = "https://weread.qq.com/api/user/notebook"
 WEREAD_BOOKMARKLIST_URL = "https://weread.qq.com/web/book/bookmarklist"
-WEREAD_CHAPTER_INFO = (
-    "https://weread.qq.com/web/book/bookmarklist"  # NOTE: this is a temp fix
-)
 WEREAD_READ_PROGRESS_URL = "https://weread.qq.com/web/book/getProgress"
 WEREAD_REVIEW_LIST_URL = "https://weread.qq.com/web/review/list"
 WEREAD_BOOK_INFO = "https://weread.qq.com/api/book/info"
+WEREAD_READER_URL = "https://weread.qq.com/web/reader/"
 
 # API Response Keys
 UPDATED_KEY = "updated"
@@ -15,6 +13,10 @@ BOOKS_KEY = "books"
 REVIEWS_KEY = "reviews"
 SORT_KEY = "sort"
 
+# Book info fields read by BookBuilder; the book info request is skipped when
+# the notebook list entry already carries all of them
+REQUIRED_BOOK_KEYS = frozenset({"isbn", "newRating"})
+
 # Log Prefixes
 LOG_PREFIX_CONNECTION_TEST = "connection test"
 LOG_PREFIX_NOTEBOOK_LIST = "notebook list"
@@ -1,18 +1,23 @@
 import argparse
 import functools
 import random
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional, Tuple
-
-from notion_client import Client
+from typing import AbstractSet, Any, Callable, Dict, List, Optional, Tuple
 
 from book import Book
 from book_builder import BookBuilder
 from logger import logger
+from notion.client import create_notion_client
 from notion.database import NotionDatabaseManager
 from notion.page_builder import PageContentBuilder
 from weread import WeReadClient
 
+# Number of books uploaded to Notion concurrently
+NOTION_MAX_WORKERS = 3
+# Number of books built from WeRead data concurrently
+BUILD_MAX_WORKERS = 4
+
 
 def parse_arguments() -> Tuple[str, str, str, bool]:
     parser = argparse.ArgumentParser()
@@ -35,16 +40,54 @@ def process_books(
     latest_sort: int,
     book_processor: Callable[[Book], Optional[str]],
     builder: BookBuilder,
+    existing_book_ids: AbstractSet[str] = frozenset(),
+    max_workers: int = NOTION_MAX_WORKERS,
+    build_workers: int = BUILD_MAX_WORKERS,
 ) -> None:
-    """Process a list of books and sync them to Notion"""
+    """Process a list of books and sync them to Notion
+
+    Books are built concurrently from WeRead data, and each built book is
+    handed to a second thread pool for its Notion upload as soon as it is
+    ready.
+
+    Uploads finish in any order, so an interrupted run can leave a book with
+    a lower sort missing while higher ones are synced. A book is therefore
+    only skipped when its sort is at most ``latest_sort`` and it already has
+    a page in ``existing_book_ids``.
+    """
+    pending_books = []
     for book_json in books_json_list:
         try:
             current_sort = book_json.get("sort")
-            if current_sort <= latest_sort:
+            book_id = book_json.get("book", book_json).get("bookId")
+            if current_sort <= latest_sort and book_id in existing_book_ids:
                 logger.info(f"Skipping book with sort {current_sort} <= {latest_sort}")
                 continue
-
-            book = builder.build(book_json)
+        except Exception as e:
+            logger.error(
+                f"Unhandled error processing book data {book_json.get('book', {}).get('title')}: {e}"
+            )
+            continue
+        pending_books.append(book_json)
+
+    with (
+        ThreadPoolExecutor(max_workers=build_workers) as build_executor,
+        ThreadPoolExecutor(max_workers=max_workers) as executor,
+    ):
+        build_futures: Dict[Future, Dict[str, Any]] = {
+            build_executor.submit(builder.build, book_json): book_json
+            for book_json in pending_books
+        }
+        futures: Dict[Future, Book] = {}
+        for build_future in as_completed(build_futures):
+            book_json = build_futures[build_future]
+            try:
+                book = build_future.result()
+            except Exception as e:
+                logger.error(
+                    f"Unhandled error processing book data {book_json.get('book', {}).get('title')}: {e}"
+                )
+                continue
 
             if not book:
                 logger.error(
@@ -53,18 +96,21 @@ def process_books(
                 continue
 
             logger.info(f"Processing book: {book.bookId} - {book.title} - {book.isbn}")
+            futures[executor.submit(book_processor, book)] = book
+
+        for future in as_completed(futures):
+            book = futures[future]
+            try:
+                page_id = future.result()
+            except Exception as e:
+                logger.error(f"Unhandled error processing book {book.title}: {e}")
+                continue
 
-            page_id = book_processor(book)
             if page_id:
                 logger.info(f"Successfully processed book: {book.title}")
             else:
                 logger.error(f"Failed to process book: {book.title}")
 
-        except Exception as e:
-            logger.error(
-                f"Unhandled error processing book data {book_json.get('book', {}).get('title')}: {e}"
-            )
-
 
 def process_book(
     book: Book,
@@ -131,7 +177,7 @@ def _sanity_check_weread_api(weread_client: WeReadClient) -> None:
 def main() -> None:
     weread_cookie, notion_token, database_id, dev_mode = parse_arguments()
 
-    client = Client(auth=notion_token)
+    client = create_notion_client(notion_token)
     database_manager = NotionDatabaseManager(client, database_id)
     content_builder = PageContentBuilder()
 
@@ -154,15 +200,25 @@ def main() -> None:
 
     if dev_mode:
         logger.info("Running in dev mode - randomly selecting 30 books")
-        books_json_list = books_json_list[-5:] + random.sample(
+        sampled_books = books_json_list[-5:] + random.sample(
             books_json_list, min(30, len(books_json_list))
         )
+        # The two selections can overlap; sync each book only once
+        books_json_list = list(
+            {book["book"]["bookId"]: book for book in sampled_books}.values()
+        )
         logger.info(
             f"Selected books: {[{'title': book['book']['title'], 'sort': book['sort']} for book in books_json_list]}"
         )
 
     start_time = datetime.now()
-    process_books(books_json_list, latest_sort, bound_process_book, book_builder)
+    process_books(
+        books_json_list,
+        latest_sort,
+        bound_process_book,
+        book_builder,
+        existing_book_ids=database_manager.get_existing_book_ids(),
+    )
     logger.info(f"Total processing time: {datetime.now() - start_time}")
 
 
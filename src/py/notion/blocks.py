@@ -1,8 +1,6 @@
-from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import Dict, Optional, TypeAlias
+from typing import Any, Dict, List, Optional, Tuple, TypeAlias
 
-BlockDict: TypeAlias = Dict
+BlockDict: TypeAlias = Dict[str, Any]
 
 
 # STYLE_EMOJIS: Dict[Optional[int], str] = {
@@ -12,99 +10,60 @@ BlockDict: TypeAlias = Dict
 #     3: "📖",  # Chapter/Heading reference?
 # }
 
-COLOR_STYLES: Dict[Optional[int], str] = {
-    1: "red",
-    2: "purple",
-    3: "blue",
-    4: "green",
-    5: "yellow",
-    None: "default",  # Added default for safety
-}
+# Indexed by WeRead colorStyle (1-5); index 0 is the fallback for unknown values
+COLOR_STYLES: Tuple[str, ...] = ("default", "red", "purple", "blue", "green", "yellow")
 
-# --- Abstract Base Class --- #
 
+def _rich_text_list(content: str) -> List[Dict]:
+    """Wraps plain text into a Notion rich_text array."""
+    return [{"type": "text", "text": {"content": content}}]
 
-class NotionBlock(ABC):
-    """Abstract base class for all Notion blocks."""
 
-    @abstractmethod
-    def to_dict(self) -> BlockDict:
-        """Converts the block object into its dictionary representation for the Notion API."""
-        pass
+# --- Block Factories --- #
+# Build the API dicts directly.
 
 
-# --- Concrete Block Classes --- #
+def table_of_contents_block(color: str = "default") -> BlockDict:
+    return {"type": "table_of_contents", "table_of_contents": {"color": color}}
 
 
-@dataclass
-class TableOfContentsBlock(NotionBlock):
-    """Represents a Table of Contents block."""
+def heading_block(
+    level: int, content: str, color: str = "default", is_toggleable: bool = False
+) -> BlockDict:
+    heading_type = f"heading_{min(level, 3)}"  # Ensure level is 1, 2, or 3
+    return {
+        "type": heading_type,
+        heading_type: {
+            "rich_text": _rich_text_list(content),
+            "color": color,
+            "is_toggleable": is_toggleable,
+        },
+    }
 
-    color: str = "default"
 
-    def to_dict(self) -> BlockDict:
-        return {"type": "table_of_contents", "table_of_contents": {"color": self.color}}
+def quote_block(content: str, color: str = "default") -> BlockDict:
+    return {
+        "type": "quote",
+        "quote": {
+            "rich_text": _rich_text_list(content),
+            "color": color,
+        },
+    }
 
 
-@dataclass
-class HeadingBlock(NotionBlock):
-    """Represents a Heading block (levels 1, 2, or 3)."""
+def callout_block(content: str, color_style: Optional[int] = None) -> BlockDict:
+    # Determine color: Use color_style, default to 'default' for anything
+    # that is not a known integer style (WeRead data is not always typed)
+    color = (
+        COLOR_STYLES[color_style]
+        if isinstance(color_style, int) and 0 < color_style < len(COLOR_STYLES)
+        else COLOR_STYLES[0]
+    )
 
-    level: int
-    content: str
-    color: str = "default"
-    is_toggleable: bool = False
-
-    def to_dict(self) -> BlockDict:
-        heading_type = f"heading_{min(self.level, 3)}"  # Ensure level is 1, 2, or 3
-        return {
-            "type": heading_type,
-            heading_type: {
-                "rich_text": [{"type": "text", "text": {"content": self.content}}],
-                "color": self.color,
-                "is_toggleable": self.is_toggleable,
-            },
-        }
-
-
-@dataclass
-class QuoteBlock(NotionBlock):
-    """Represents a Quote block."""
-
-    content: str
-    color: str = "default"
-
-    def to_dict(self) -> BlockDict:
-        return {
-            "type": "quote",
-            "quote": {
-                "rich_text": [{"type": "text", "text": {"content": self.content}}],
-                "color": self.color,
-            },
-        }
-
-
-@dataclass
-class CalloutBlock(NotionBlock):
-    """Represents a Callout block."""
-
-    content: str
-    style: Optional[int] = 2
-    color_style: Optional[int] = None
-    review_id: Optional[str] = None  # If review_id exists, style is ignored for emoji
-
-    def to_dict(self) -> BlockDict:
-        # Determine emoji: Use specific emoji if it's a review, otherwise use style, default to Note emoji
-        # emoji_key = None if self.review_id is not None else self.style
-        # emoji = STYLE_EMOJIS.get(emoji_key, STYLE_EMOJIS[None])
-        # Determine color: Use color_style, default to 'default'
-        color = COLOR_STYLES.get(self.color_style, COLOR_STYLES[None])
-
-        return {
-            "type": "callout",
-            "callout": {
-                "rich_text": [{"type": "text", "text": {"content": self.content}}],
-                # "icon": {"emoji": emoji},
-                "color": color,
-            },
-        }
+    return {
+        "type": "callout",
+        "callout": {
+            "rich_text": _rich_text_list(content),
+            "color": color,
+        },
+    }
@@ -0,0 +1,63 @@
+from typing import Any, Optional
+
+import httpx
+from notion_client import Client
+
+from utils import json_dumps, json_loads
+
+# One keep-alive pool shared by every Notion call, sized for concurrent uploads
+NOTION_CONNECTION_LIMITS = httpx.Limits(
+    max_connections=20, max_keepalive_connections=20, keepalive_expiry=60
+)
+
+
+class _OrjsonResponse(httpx.Response):
+    """httpx response whose json() is decoded with orjson."""
+
+    def json(self, **kwargs: Any) -> Any:
+        return json_loads(self.content)
+
+
+class _OrjsonTransport(httpx.BaseTransport):
+    """Wraps a transport so responses are returned as _OrjsonResponse."""
+
+    def __init__(self, transport: httpx.BaseTransport):
+        self._transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        response = self._transport.handle_request(request)
+        return _OrjsonResponse(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=response.stream,
+            extensions=response.extensions,
+        )
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class NotionHTTPClient(httpx.Client):
+    """httpx client that (de)serializes Notion JSON payloads with orjson."""
+
+    def __init__(self, transport: Optional[httpx.BaseTransport] = None, **kwargs):
+        super().__init__(
+            transport=_OrjsonTransport(
+                transport
+                or httpx.HTTPTransport(http2=True, limits=NOTION_CONNECTION_LIMITS)
+            ),
+            **kwargs,
+        )
+
+    def build_request(self, method: str, url: Any, *, json: Any = None, **kwargs):
+        if json is not None:
+            headers = httpx.Headers(kwargs.pop("headers", None))
+            headers["Content-Type"] = "application/json"
+            kwargs["headers"] = headers
+            kwargs["content"] = json_dumps(json)
+        return super().build_request(method, url, **kwargs)
+
+
+def create_notion_client(notion_token: str) -> Client:
+    """Creates a Notion client backed by NotionHTTPClient."""
+    return Client(auth=notion_token, client=NotionHTTPClient())
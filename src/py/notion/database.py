@@ -1,29 +1,114 @@
+import random
+import threading
 import time
-from functools import wraps
-from typing import Any, Callable, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, wraps
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, Optional
 
+import httpx
 from notion_client import Client
-from notion_client.errors import APIResponseError
+from notion_client.errors import HTTPResponseError, RequestTimeoutError
 
 from book import Book
 from logger import logger
 from notion.blocks import BlockDict
 from notion.page import BookPage
+from rate_limiter import AdaptiveTokenBucket
+
+# Notion allows an average of 3 requests per second; stay slightly below it
+# and back off further while the API answers with rate limits or 5xx errors
+_notion_limiter = AdaptiveTokenBucket(rate=2.7, capacity=3)
+
+# Upper bound on concurrent requests issued for a single book
+MAX_CONCURRENT_REQUESTS = 4
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+# Responses that guarantee Notion did not apply the request
+UNAPPLIED_STATUS_CODES = {429, 503}
+NOTION_REQUEST_ERRORS = (HTTPResponseError, RequestTimeoutError, httpx.TransportError)
+
+
+def _is_retryable(error: Exception, idempotent: bool = True) -> bool:
+    """Rate limits, server errors and transport failures are worth retrying.
+
+    A non-idempotent request (page creation, block appends) may already have
+    been applied after a read timeout or a gateway error, so it is only
+    retried when the error shows it never reached Notion.
+    """
+    if isinstance(error, HTTPResponseError):
+        if idempotent:
+            return error.status in RETRYABLE_STATUS_CODES
+        return error.status in UNAPPLIED_STATUS_CODES
+    return idempotent or isinstance(error, httpx.ConnectError)
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    """Returns the server-requested wait from a Retry-After header, if any."""
+    headers = getattr(error, "headers", None)
+    if not headers or "Retry-After" not in headers:
+        return None
+    try:
+        return float(headers["Retry-After"])
+    except ValueError:
+        return None
+
+
+def retry(
+    max_retries: int = 3,
+    initial_delay: float = 1.0,
+    max_delay: float = 30.0,
+    jitter: float = 0.5,
+):
+    """Retries the wrapped request on transient Notion errors.
+
+    The wrapped function may take an ``idempotent`` keyword argument; passing
+    ``idempotent=False`` restricts retries to errors that prove the request
+    was not applied.
+    """
 
-
-def retry(max_retries: int = 2, initial_delay: float = 1.0):
     def decorator(func: Callable):
+        def retry_after_error(error: Exception, sent_at: float, args, kwargs):
+            idempotent = kwargs.get("idempotent", True)
+            for attempt in range(max_retries + 1):
+                if attempt == max_retries or not _is_retryable(error, idempotent):
+                    logger.error("Error in function %s: %s", func.__name__, error)
+                    raise error
+                if isinstance(error, HTTPResponseError):
+                    _notion_limiter.on_throttle(sent_at)
+                retry_after = _retry_after_seconds(error)
+                if retry_after is not None:
+                    delay = retry_after + random.uniform(0, jitter)
+                else:
+                    delay = initial_delay * 2**attempt * (1 + random.uniform(0, jitter))
+                delay = min(max_delay, delay)
+                logger.warning(
+                    "Retrying %s in %.1fs after error: %s", func.__name__, delay, error
+                )
+                time.sleep(delay)
+
+                _notion_limiter.acquire()
+                sent_at = time.monotonic()
+                try:
+                    result = func(*args, **kwargs)
+                except NOTION_REQUEST_ERRORS as e:
+                    error = e
+                else:
+                    _notion_limiter.on_success()
+                    return result
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            delay = initial_delay
-            for _ in range(max_retries):
-                try:
-                    time.sleep(delay)  # Always wait before making a request
-                    return func(*args, **kwargs)
-                except APIResponseError as e:
-                    logger.error(f"Error in function {func.__name__}: {e}")
-                    raise
-            return None
+            # First attempt runs straight through; the retry loop and its
+            # backoff only come into play once a request has failed
+            _notion_limiter.acquire()
+            sent_at = time.monotonic()
+            try:
+                result = func(*args, **kwargs)
+            except NOTION_REQUEST_ERRORS as e:
+                return retry_after_error(e, sent_at, args, kwargs)
+            _notion_limiter.on_success()
+            return result
 
         return wrapper
 
@@ -36,150 +121,247 @@ class NotionDatabaseManager:
     def __init__(self, client: Client, database_id: str):
         self.client = client
         self.database_id = database_id
+        self._parent = {"database_id": database_id, "type": "database_id"}
+        # Snapshot of the pages already in the database, loaded lazily with a
+        # single paginated query: BookId -> page ids, plus the highest Sort
+        self._existing_pages: Optional[Dict[str, List[str]]] = None
+        self._latest_sort = 0
+        self._existing_pages_lock = threading.Lock()
+        self._has_updated_time = self._probe_property("UpdatedTime")
+
+    def _probe_property(self, property_name: str) -> bool:
+        """Checks once whether the database schema has the given property."""
+        response = self._make_request(
+            partial(self.client.databases.retrieve, database_id=self.database_id)
+        )
+        if not response:
+            # Schema unknown; keep sending the property as before
+            return True
+        return property_name in response.get("properties", {})
 
     def create_book_page(self, book: Book) -> Optional[str]:
         """Creates a new page for a book in the database"""
-        logger.info(f"Creating page for book: {book.title} with ID: {book.bookId}")
-        book_page = BookPage(book)
-        properties = book_page.build_notion_property()
-        icon = {"type": "external", "external": {"url": book.cover}}
-
-        return self._create_page(properties, icon)
+        logger.info("Creating page for book: %s with ID: %s", book.title, book.bookId)
+        book_page = BookPage(book, include_updated_time=self._has_updated_time)
+        page_id = self._create_page(book_page.build_notion_property(), book.icon)
+        if page_id:
+            # Keep the index current so a later sync of the same book replaces it
+            self._get_existing_pages().setdefault(book.bookId, []).append(page_id)
+        return page_id
 
     def check_and_delete(self, bookId: str) -> None:
         """检查是否已经插入过 如果已经插入了就删除"""
-        filter = self._create_filter("BookId", bookId)
-
-        def query_op():
-            return self.client.databases.query(
-                database_id=self.database_id, filter=filter
+        existing_pages = self._get_existing_pages()
+        page_ids = existing_pages.pop(bookId, [])
+        if not page_ids:
+            return
+        failed_ids = self._delete_existing_entries(page_ids)
+        if failed_ids:
+            # Keep the pages that are still in Notion so a later sync retries them
+            existing_pages.setdefault(bookId, []).extend(failed_ids)
+            logger.warning(
+                "Failed to delete existing Notion page(s) %s for book %s.",
+                failed_ids,
+                bookId,
             )
 
-        response = self._make_request(query_op)
-        if response:
-            self._delete_existing_entries(response)
-
     def get_latest_sort(self) -> int:
         """获取database中的最新时间"""
-        filter = {"property": "Sort", "number": {"is_not_empty": True}}
-        sorts = [{"property": "Sort", "direction": "descending"}]
-
-        def query_op():
-            return self.client.databases.query(
-                database_id=self.database_id, filter=filter, sorts=sorts, page_size=1
+        self._get_existing_pages()
+        if self._latest_sort:
+            logger.info("Latest sort found: %s", self._latest_sort)
+        else:
+            logger.info("No previous sort value found in Notion database.")
+        return self._latest_sort
+
+    def get_existing_book_ids(self) -> frozenset:
+        """Returns the BookIds that already have a page in the database."""
+        return frozenset(self._get_existing_pages())
+
+    def _get_existing_pages(self) -> Dict[str, List[str]]:
+        with self._existing_pages_lock:
+            if self._existing_pages is None:
+                self._existing_pages = self._load_existing_pages()
+            return self._existing_pages
+
+    def _load_existing_pages(self) -> Dict[str, List[str]]:
+        """Queries every page of the database once and indexes it by BookId.
+
+        Raises RuntimeError if any page of the query fails: a partial index
+        would make the sync re-create books without deleting their old pages.
+        """
+        existing_pages: Dict[str, List[str]] = {}
+        latest_sort = 0
+        start_cursor = None
+        while True:
+            response = self._make_request(
+                partial(
+                    self.client.databases.query,
+                    database_id=self.database_id,
+                    start_cursor=start_cursor,
+                    page_size=100,
+                )
             )
+            if not response:
+                raise RuntimeError(
+                    "Failed to query existing pages from Notion database."
+                )
 
-        response = self._make_request(query_op)
-        return self._extract_latest_sort(response) if response else 0
+            for page in response.get("results", []):
+                properties = page["properties"]
+                book_id = self._extract_book_id(properties)
+                if book_id:
+                    existing_pages.setdefault(book_id, []).append(page["id"])
+                else:
+                    logger.warning("Notion page %s has no BookId.", page["id"])
+                latest_sort = max(latest_sort, self._extract_sort(properties))
+
+            if not response.get("has_more"):
+                break
+            start_cursor = response.get("next_cursor")
+
+        logger.info("Found %d existing book(s) in Notion.", len(existing_pages))
+        self._latest_sort = latest_sort
+        return existing_pages
+
+    @staticmethod
+    def _extract_book_id(properties: Dict) -> Optional[str]:
+        try:
+            return properties["BookId"]["rich_text"][0]["plain_text"]
+        except (KeyError, IndexError, TypeError):
+            return None
 
-    def _extract_latest_sort(self, response: Dict) -> int:
-        if response and len(response.get("results", [])) == 1:
-            sort_property = response["results"][0].get("properties", {}).get("Sort", {})
-            latest_sort = sort_property.get("number", 0)
-            logger.info(f"Latest sort found: {latest_sort}")
-            return latest_sort
-        logger.info("No previous sort value found in Notion database.")
-        return 0
+    @staticmethod
+    def _extract_sort(properties: Dict) -> int:
+        try:
+            return properties["Sort"]["number"] or 0
+        except (KeyError, TypeError):
+            return 0
 
     def _create_page(self, properties: Dict, icon: Dict) -> Optional[str]:
-        parent = {"database_id": self.database_id, "type": "database_id"}
-
-        def create_op():
-            return self.client.pages.create(
-                parent=parent, icon=icon, properties=properties
-            )
-
-        response = self._make_request(create_op)
+        response = self._make_request(
+            partial(
+                self.client.pages.create,
+                parent=self._parent,
+                icon=icon,
+                properties=properties,
+            ),
+            idempotent=False,
+        )
         return response["id"] if response else None
 
-    def _create_filter(self, property_name: str, value: str) -> Dict:
-        return {"property": property_name, "rich_text": {"equals": value}}
-
-    def _delete_existing_entries(self, response: Dict) -> None:
-        count = 0
-        for result in response.get("results", []):
-            block_id = result.get("id")
-            if block_id:
-
-                def delete_op(block_id=block_id):
-                    return self.client.blocks.delete(block_id=block_id)
-
-                if self._make_request(delete_op):
-                    count += 1
+    def _delete_existing_entries(self, page_ids: List[str]) -> List[str]:
+        """Deletes the given pages and returns the ids that were not deleted."""
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+            futures = {
+                page_id: executor.submit(
+                    self._make_request,
+                    partial(self.client.blocks.delete, block_id=page_id),
+                )
+                for page_id in page_ids
+            }
+
+        failed_ids = []
+        for page_id, future in futures.items():
+            try:
+                result = future.result()
+            except NOTION_REQUEST_ERRORS:
+                result = None  # Already logged by the retry decorator
+            if not result:
+                failed_ids.append(page_id)
+
+        count = len(page_ids) - len(failed_ids)
         if count > 0:
-            logger.info(f"Deleted {count} existing Notion page(s).")
+            logger.info("Deleted %d existing Notion page(s).", count)
+        return failed_ids
 
     def add_children(
-        self, page_id: str, children: List[BlockDict]
+        self, page_id: str, children: Iterable[BlockDict]
     ) -> Optional[List[Dict]]:
-        results = []
-        chunk_size = 50
-
-        for i in range(0, len(children), chunk_size):
-            chunk = children[i : i + chunk_size]
+        """Appends blocks to a page in chunks, consuming ``children`` lazily.
 
-            def append_op(chunk=chunk):
-                return self.client.blocks.children.append(
-                    block_id=page_id, children=chunk
-                )
-
-            if i > 0:
-                time.sleep(0.5)
-
-            response = self._make_request(append_op)
-            if response and "results" in response:
-                results.extend(response["results"])
-            elif not response:
+        ``children`` may be any iterable; at most one chunk of it is held at a
+        time.
+        """
+        results = []
+        chunk_size = 100  # Notion accepts at most 100 children per request
+
+        blocks = iter(children)
+        while chunk := list(islice(blocks, chunk_size)):
+            response = self._make_request(
+                partial(
+                    self.client.blocks.children.append,
+                    block_id=page_id,
+                    children=chunk,
+                ),
+                idempotent=False,
+            )
+            if not response:
                 logger.error(
-                    f"Failed to add child chunk for page {page_id}. No response."
+                    "Failed to add child chunk for page %s. No response.", page_id
                 )
                 return None
+            chunk_results = response.get("results", [])
+            if len(chunk_results) != len(chunk):
+                logger.warning(
+                    "Incomplete children addition for page %s. "
+                    "Expected %d, got %d results.",
+                    page_id,
+                    len(chunk),
+                    len(chunk_results),
+                )
+                return None
+            results.extend(chunk_results)
 
-        if (
-            len(results) > 0
-            and len(results) % chunk_size == 0
-            or len(results) == len(children)
-        ):
-            return results
-        elif len(children) == 0:
-            return []
-        else:
-            logger.warning(
-                f"Potentially incomplete children addition for page {page_id}. Expected {len(children)}, got {len(results)} results."
-            )
-            return None
+        return results
 
     def add_grandchildren(
-        self, parent_blocks: List[Dict], grandchildren: Dict[int, BlockDict]
+        self, parent_blocks: List[Dict], grandchildren: Dict[int, List[BlockDict]]
     ) -> None:
-        for block_index, block_content in grandchildren.items():
+        append_ops = []
+        for block_index, block_list in grandchildren.items():
             if block_index >= len(parent_blocks):
                 logger.warning(
-                    f"Grandchild index {block_index} out of bounds for parent_blocks list."
+                    "Grandchild index %d out of bounds for parent_blocks list.",
+                    block_index,
                 )
                 continue
             block_id = parent_blocks[block_index].get("id")
             if not block_id:
                 logger.warning(
-                    f"Parent block at index {block_index} has no ID for grandchild addition."
+                    "Parent block at index %d has no ID for grandchild addition.",
+                    block_index,
                 )
                 continue
-
-            def append_op(block_id=block_id, block_content=block_content):
-                return self.client.blocks.children.append(
-                    block_id=block_id, children=[block_content]
+            append_ops.append(
+                partial(
+                    self.client.blocks.children.append,
+                    block_id=block_id,
+                    children=block_list,
                 )
+            )
 
-            self._make_request(append_op)
+        # Each block list goes under a different parent block, so the appends
+        # are order-independent; the shared rate limiter bounds the request rate.
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+            list(
+                executor.map(partial(self._make_request, idempotent=False), append_ops)
+            )
 
     @retry()
-    def _make_request(self, operation: Callable[[], Any]) -> Any:
-        """Generic method to make Notion API requests with retry logic"""
+    def _make_request(
+        self, operation: Callable[[], Any], idempotent: bool = True
+    ) -> Any:
+        """Generic method to make Notion API requests with retry logic
+
+        Pass ``idempotent=False`` for requests that must not be repeated once
+        Notion may have applied them (see ``_is_retryable``).
+        """
         try:
             return operation()
-        except APIResponseError as e:
-            logger.error(f"Notion API Error during operation {operation.__name__}: {e}")
-            raise
+        except NOTION_REQUEST_ERRORS:
+            raise  # Handled by the retry decorator
         except Exception as e:
-            logger.error(f"Unexpected error during operation {operation.__name__}: {e}")
+            operation_name = getattr(operation, "func", operation).__name__
+            logger.error("Unexpected error during operation %s: %s", operation_name, e)
             return None
@@ -1,7 +1,9 @@
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from typing import Dict
 
 from book import Book
+from constants import WEREAD_READER_URL
 from utils import (
     calculate_book_str_id,
     format_reading_time,
@@ -9,6 +11,22 @@ from utils import (
 )
 
 
+def _rich_text(content: str) -> Dict:
+    """Wraps plain text into a Notion rich_text property value."""
+    return {"rich_text": [{"type": "text", "text": {"content": content}}]}
+
+
+def _title(content: str) -> Dict:
+    """Wraps plain text into a Notion title property value."""
+    return {"title": [{"type": "text", "text": {"content": content}}]}
+
+
+@lru_cache(maxsize=256)
+def _cover(url: str) -> Dict:
+    """Builds the Cover files property; shared across books with the same cover."""
+    return {"files": [{"type": "external", "name": "Cover", "external": {"url": url}}]}
+
+
 class Page(ABC):
     @abstractmethod
     def build_notion_property(self) -> Dict:
@@ -17,68 +35,44 @@ class Page(ABC):
 
 
 class BookPage(Page):
-    def __init__(self, book: Book):
+    def __init__(self, book: Book, include_updated_time: bool = True):
         self.book = book
+        self.include_updated_time = include_updated_time
 
     def build_notion_property(self) -> Dict:
         """Builds and returns the Notion properties dictionary for the book."""
         return self._build_notion_property()
 
     def _build_notion_property(self) -> Dict:
-        """Creates a dictionary of Notion properties from the book instance."""
+        """Creates a dictionary of Notion properties from the book instance.
+
+        Optional properties are only included when the book has a value for them.
+        """
+        book = self.book
         return {
-            "BookName": {
-                "title": [{"type": "text", "text": {"content": self.book.title}}]
-            },
-            "BookId": {
-                "rich_text": [{"type": "text", "text": {"content": self.book.bookId}}]
-            },
-            "ISBN": {
-                "rich_text": [{"type": "text", "text": {"content": self.book.isbn}}]
-            },
-            "URL": {
-                "url": f"https://weread.qq.com/web/reader/{calculate_book_str_id(self.book.bookId)}"
-            },
-            "Author": {
-                "rich_text": [{"type": "text", "text": {"content": self.book.author}}]
-            },
-            "Sort": {"number": self.book.sort},
-            "Rating": {"number": self.book.rating},
-            "Cover": {
-                "files": [
-                    {
-                        "type": "external",
-                        "name": "Cover",
-                        "external": {"url": self.book.cover},
-                    }
-                ]
-            },
-            "Category": {
-                "select": {
-                    "name": self.book.category if self.book.category else "未分类"
-                }
-            },
-            "Status": {
-                "select": {"name": self.book.status if self.book.status else ""}
-            },
-            "ReadingTime": {
-                "rich_text": [
-                    {
-                        "type": "text",
-                        "text": {
-                            "content": (
-                                format_reading_time(self.book.reading_time)
-                                if self.book.reading_time
-                                else ""
-                            )
-                        },
-                    }
-                ]
-            },
-            "FinishedDate": (
-                format_timestamp_for_notion(self.book.finished_date)
-                if self.book.finished_date
-                else {"date": None}
+            "BookName": _title(book.title),
+            "BookId": _rich_text(book.bookId),
+            "ISBN": _rich_text(book.isbn),
+            "URL": {"url": WEREAD_READER_URL + calculate_book_str_id(book.bookId)},
+            "Author": _rich_text(book.author),
+            "Sort": {"number": book.sort},
+            "Rating": {"number": book.rating},
+            "Cover": _cover(book.cover),
+            "Category": {"select": {"name": book.category or "未分类"}},
+            **({"Status": {"select": {"name": book.status}}} if book.status else {}),
+            **(
+                {"ReadingTime": _rich_text(format_reading_time(book.reading_time))}
+                if book.reading_time
+                else {}
+            ),
+            **(
+                {"FinishedDate": format_timestamp_for_notion(book.finished_date)}
+                if book.finished_date
+                else {}
+            ),
+            **(
+                {"UpdatedTime": format_timestamp_for_notion()}
+                if self.include_updated_time
+                else {}
             ),
-            "UpdatedTime": format_timestamp_for_notion(),
         }
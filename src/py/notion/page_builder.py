@@ -1,13 +1,14 @@
+from collections import defaultdict
 from typing import Dict, List, Tuple
 
 from book import Book
 from logger import logger
 from notion.blocks import (
     BlockDict,
-    CalloutBlock,
-    HeadingBlock,
-    QuoteBlock,
-    TableOfContentsBlock,
+    callout_block,
+    heading_block,
+    quote_block,
+    table_of_contents_block,
 )
 
 
@@ -20,7 +21,7 @@ class PageContentBuilder:
 
     def build_book_content(
         self, book: Book
-    ) -> Tuple[List[BlockDict], Dict[int, BlockDict]]:
+    ) -> Tuple[List[BlockDict], Dict[int, List[BlockDict]]]:
         """Builds the complete content structure for a book page"""
         children = []
         grandchild = {}
@@ -39,30 +40,32 @@ class PageContentBuilder:
         if summary:
             self._add_summary(children, summary)
 
-        logger.info(f"Children generated for {book.title}: {len(children)} blocks")
-        logger.info(
-            f"Grandchildren generated for {book.title}: {len(grandchild)} blocks"
+        logger.debug(
+            "Blocks generated for %s: children=%d grandchildren=%d",
+            book.title,
+            len(children),
+            len(grandchild),
         )
         return children, grandchild
 
     def _add_table_of_contents(self, children: List[BlockDict]) -> None:
-        # Instantiate block directly and call to_dict()
-        children.append(HeadingBlock(level=1, content="目录").to_dict())
-        children.append(TableOfContentsBlock().to_dict())
+        children.append(heading_block(level=1, content="目录"))
+        children.append(table_of_contents_block())
 
     def _add_chapter_content(
         self,
         children: List[BlockDict],
-        grandchild: Dict[int, BlockDict],
+        grandchild: Dict[int, List[BlockDict]],
         chapter: Dict[int, Dict],
         bookmark_list: List[Dict],
     ) -> None:
         grouped_bookmarks = self._group_bookmarks_by_chapter(bookmark_list)
-        logger.info(f"Grouped bookmarks: {grouped_bookmarks}")
+        logger.debug("Grouped bookmarks: %s", grouped_bookmarks)
 
-        for chapter_id, bookmarks in grouped_bookmarks.items():
-            logger.info(f"Chapter ID: {chapter_id}")
-            logger.info(f"Bookmarks: {bookmarks}")
+        # Iterate in chapter order rather than first-bookmark order
+        for chapter_id in sorted(grouped_bookmarks):
+            bookmarks = grouped_bookmarks[chapter_id]
+            logger.debug("Chapter ID: %s, bookmarks: %s", chapter_id, bookmarks)
             if chapter_id in chapter:
                 children.append(self._create_chapter_heading(chapter, chapter_id))
 
@@ -72,70 +75,54 @@ class PageContentBuilder:
     def _add_bookmarks(
         self, children: List[BlockDict], bookmark_list: List[Dict]
     ) -> None:
-        for bookmark in bookmark_list:
-            # Instantiate CalloutBlock directly
-            children.append(
-                CalloutBlock(
-                    content=bookmark.get("markText", ""),  # Provide default for content
-                    style=bookmark.get("style"),
-                    color_style=bookmark.get("colorStyle"),
-                    review_id=bookmark.get("reviewId"),
-                ).to_dict()
-            )
+        children.extend(map(self._create_bookmark_callout, bookmark_list))
 
     def _add_summary(self, children: List[BlockDict], summary: List[Dict]) -> None:
-        # Instantiate HeadingBlock directly
-        children.append(HeadingBlock(level=1, content="点评").to_dict())
-        for review in summary:
-            review_data = review.get("review", {})
-            # Instantiate CalloutBlock directly
-            children.append(
-                CalloutBlock(
-                    content=review_data.get("content", ""),  # Provide default
-                    style=review.get("style"),  # Style might be on the outer dict
-                    color_style=review.get(
-                        "colorStyle"
-                    ),  # colorStyle might be on the outer dict
-                    review_id=review_data.get("reviewId"),
-                ).to_dict()
-            )
+        children.append(heading_block(level=1, content="点评"))
+        children.extend(map(self._create_review_callout, summary))
+
+    @staticmethod
+    def _create_review_callout(review: Dict) -> BlockDict:
+        review_data = review.get("review", {})
+        return callout_block(
+            content=review_data.get("content", ""),  # Provide default
+            color_style=review.get(
+                "colorStyle"
+            ),  # colorStyle might be on the outer dict
+        )
 
     @staticmethod
     def _group_bookmarks_by_chapter(bookmark_list: List[Dict]) -> Dict[int, List[Dict]]:
-        # This method remains the same as it doesn't involve block creation
-        grouped = {}
+        grouped = defaultdict(list)
         for bookmark in bookmark_list:
-            chapter_id = bookmark.get("chapterUid", 1)
-            if chapter_id not in grouped:
-                grouped[chapter_id] = []
-            grouped[chapter_id].append(bookmark)
+            grouped[bookmark.get("chapterUid", 1)].append(bookmark)
         return grouped
 
     def _create_chapter_heading(
         self, chapter: Dict[int, Dict], chapter_id: int
     ) -> BlockDict:
         chapter_info = chapter[chapter_id]
-        # Instantiate HeadingBlock directly
-        return HeadingBlock(
+        return heading_block(
             level=chapter_info.get("level", 1),
             content=chapter_info.get("title", ""),  # Provide default
-        ).to_dict()
+        )
+
+    @staticmethod
+    def _create_bookmark_callout(bookmark: Dict) -> BlockDict:
+        return callout_block(
+            content=bookmark.get("markText", ""),  # Provide default
+            color_style=bookmark.get("colorStyle"),
+        )
 
     def _add_bookmark_with_abstract(
         self,
         children: List[BlockDict],
-        grandchild: Dict[int, BlockDict],
+        grandchild: Dict[int, List[BlockDict]],
         bookmark: Dict,
     ) -> None:
-        # Instantiate CalloutBlock directly
-        callout_block = CalloutBlock(
-            content=bookmark.get("markText", ""),  # Provide default
-            style=bookmark.get("style"),
-            color_style=bookmark.get("colorStyle"),
-            review_id=bookmark.get("reviewId"),
-        )
-        children.append(callout_block.to_dict())
+        children.append(self._create_bookmark_callout(bookmark))
 
         if abstract := bookmark.get("abstract"):
-            # Instantiate QuoteBlock directly
-            grandchild[len(children) - 1] = QuoteBlock(content=abstract).to_dict()
+            grandchild.setdefault(len(children) - 1, []).append(
+                quote_block(content=abstract)
+            )
@@ -0,0 +1,77 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket rate limiter.
+
+    Allows bursts of up to ``capacity`` calls and paces sustained traffic to
+    ``rate`` calls per second.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        # Caller must hold self._lock
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self) -> None:
+        """Blocks until a token is available and consumes it."""
+        with self._lock:
+            self._refill()
+            # Reserve a token; a negative balance is the caller's wait time
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            time.sleep(wait)
+
+
+class AdaptiveTokenBucket(TokenBucket):
+    """Token bucket whose rate is driven by an AIMD controller.
+
+    Each success adds ``increase`` to the rate, up to the initial rate; each
+    congestion event multiplies it by ``decrease``, down to ``min_rate``.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        min_rate: float = 0.5,
+        increase: float = 0.1,
+        decrease: float = 0.5,
+    ):
+        super().__init__(rate, capacity)
+        self.max_rate = rate
+        self.min_rate = min_rate
+        self.increase = increase
+        self.decrease = decrease
+        self._last_decrease = float("-inf")
+
+    def on_success(self) -> None:
+        if self.rate >= self.max_rate:
+            return
+        with self._lock:
+            self._refill()
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self, sent_at: float) -> None:
+        """Decreases the rate for a throttled call sent at ``sent_at``.
+
+        Calls that were already in flight when the rate last dropped belong to
+        the same congestion event and do not lower it again.
+        """
+        with self._lock:
+            if sent_at < self._last_decrease:
+                return
+            self._refill()
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self._last_decrease = time.monotonic()
@@ -1,27 +1,49 @@
 from __future__ import annotations
 
 import hashlib
-import re
+import json
 from datetime import datetime
-from http.cookies import SimpleCookie
-from typing import Dict, List, Optional, Tuple, TypeAlias
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple, TypeAlias, Union
+from zoneinfo import ZoneInfo
 
 import httpx
-from pytz import timezone
 
 from logger import logger
 
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib json module
+    orjson = None
+
 CookieDict: TypeAlias = Dict[str, str]
 
+NOTION_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def json_dumps(obj: Any) -> bytes:
+    """Serialize obj to UTF-8 encoded JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def json_loads(data: Union[bytes, str]) -> Any:
+    """Deserialize JSON bytes or str, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
-def transform_id(book_id: str) -> Tuple[str, List[str]]:
+@lru_cache(maxsize=1024)
+def transform_id(book_id: str) -> Tuple[str, Tuple[str, ...]]:
     """Transform book ID into hexadecimal representation.
 
     Args:
         book_id: The book identifier string.
 
     Returns:
-        Tuple containing transformation code and list of transformed IDs.
+        Tuple containing transformation code and tuple of transformed IDs.
 
     Raises:
         ValueError: If book_id is empty or invalid.
@@ -31,20 +53,29 @@ def transform_id(book_id: str) -> Tuple[str, List[str]]:
 
     id_length = len(book_id)
 
-    if re.match("^\d*$", book_id):
-        hex_parts = [
+    # isdecimal() accepts exactly the characters matched by the regex \d
+    if book_id.isdecimal():
+        hex_parts = tuple(
             format(int(book_id[i : min(i + 9, id_length)]), "x")
             for i in range(0, id_length, 9)
-        ]
+        )
         return "3", hex_parts
 
-    hex_result = "".join(format(ord(char), "x") for char in book_id)
-    return "4", [hex_result]
+    if book_id.isascii() and book_id.isprintable():
+        # Printable ASCII is 0x20-0x7e: one byte and exactly two hex digits
+        # per character, the same output as the per-character format below
+        hex_result = book_id.encode("ascii").hex()
+    else:
+        hex_result = "".join(format(ord(char), "x") for char in book_id)
+    return "4", (hex_result,)
 
 
+@lru_cache(maxsize=1024)
 def calculate_book_str_id(book_id: str) -> str:
     """Calculate a unique string identifier for a book.
 
+    The result only depends on book_id, so it is memoized.
+
     Args:
         book_id: The original book identifier.
 
@@ -61,24 +92,26 @@ def calculate_book_str_id(book_id: str) -> str:
     md5.update(book_id.encode("utf-8"))
     digest = md5.hexdigest()
 
-    result = digest[0:3]
     code, transformed_ids = transform_id(book_id)
-    result += code + "2" + digest[-2:]
-
-    for i, transformed_id in enumerate(transformed_ids):
-        hex_length_str = format(len(transformed_id), "x").zfill(2)
-        result += hex_length_str + transformed_id
-        if i < len(transformed_ids) - 1:
-            result += "g"
+    result = "".join(
+        (
+            digest[0:3],
+            code,
+            "2",
+            digest[-2:],
+            "g".join(
+                format(len(transformed_id), "x").zfill(2) + transformed_id
+                for transformed_id in transformed_ids
+            ),
+        )
+    )
 
     if len(result) < 20:
         result += digest[0 : 20 - len(result)]
 
     final_md5 = hashlib.md5(usedforsecurity=False)
     final_md5.update(result.encode("utf-8"))
-    result += final_md5.hexdigest()[0:3]
-
-    return result
+    return result + final_md5.hexdigest()[0:3]
 
 
 def parse_cookie_string(cookie_string: str) -> Optional[httpx.Cookies]:
@@ -97,9 +130,13 @@ def parse_cookie_string(cookie_string: str) -> Optional[httpx.Cookies]:
         raise ValueError("Cookie string cannot be empty")
 
     try:
-        cookie = SimpleCookie()
-        cookie.load(cookie_string)
-        cookies_dict = {key: morsel.value for key, morsel in cookie.items()}
+        # Browser cookie headers are plain "k=v; k=v" pairs, so a direct split
+        # is enough; SimpleCookie's general Set-Cookie parser is not needed
+        cookies_dict = {}
+        for pair in cookie_string.split(";"):
+            key, sep, value = pair.partition("=")
+            if sep and (key := key.strip()):
+                cookies_dict[key] = value.strip()
         return httpx.Cookies(cookies_dict)
     except Exception as e:
         logger.error(f"Failed to parse cookie string: {str(e)}")
@@ -121,13 +158,9 @@ def format_reading_time(reading_time: int) -> str:
     hours = reading_time // 3600
     minutes = (reading_time % 3600) // 60
 
-    parts = []
     if hours > 0:
-        parts.append(f"{hours}时")
-    if minutes > 0:
-        parts.append(f"{minutes}分")
-
-    return "".join(parts)
+        return f"{hours}时{minutes}分" if minutes > 0 else f"{hours}时"
+    return f"{minutes}分" if minutes > 0 else ""
 
 
 def format_timestamp_for_notion(
@@ -143,17 +176,15 @@ def format_timestamp_for_notion(
     Returns:
         Dictionary formatted for Notion's date property.
     """
+    tz = ZoneInfo(tz_name)
     if timestamp is None:
-        date = datetime.now()
+        localized_date = datetime.now(tz)
     else:
-        date = datetime.fromtimestamp(timestamp)
-
-    tz = timezone(tz_name)
-    localized_date = date.astimezone(tz)
+        localized_date = datetime.fromtimestamp(timestamp, tz)
 
     return {
         "date": {
-            "start": localized_date.strftime("%Y-%m-%d %H:%M:%S"),
+            "start": localized_date.strftime(NOTION_DATETIME_FORMAT),
             "time_zone": tz_name,
         }
     }
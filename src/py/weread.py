@@ -1,4 +1,8 @@
-from typing import Any, Dict, List, Optional
+import random
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 import httpx
 
@@ -17,26 +21,66 @@ from constants import (
     UPDATED_KEY,
     WEREAD_BOOK_INFO,
     WEREAD_BOOKMARKLIST_URL,
-    WEREAD_CHAPTER_INFO,
     WEREAD_NOTEBOOKS_URL,
     WEREAD_READ_PROGRESS_URL,
     WEREAD_REVIEW_LIST_URL,
 )
 from logger import logger
-from utils import parse_cookie_string
+from rate_limiter import TokenBucket
+from utils import json_loads, parse_cookie_string
+
+# Shared across threads so concurrent fetches don't trip WeRead's anti-bot checks
+_weread_limiter = TokenBucket(rate=5, capacity=5)
+
+# 缺少sort字段的书籍排在最后
+_MISSING_SORT = float("inf")
+
+WEREAD_TIMEOUT = 10.0  # seconds
+# Rate limits and transient server errors are retried with backoff
+WEREAD_RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+WEREAD_MAX_RETRIES = 3
+WEREAD_RETRY_INITIAL_DELAY = 0.5  # seconds
+WEREAD_RETRY_MAX_DELAY = 10.0  # seconds
+# Connection failures are retried by the transport before any response exists
+WEREAD_CONNECT_RETRIES = 2
+# Sized for several books being built at once, each fetching five payloads
+WEREAD_CONNECTION_LIMITS = httpx.Limits(
+    max_connections=20, max_keepalive_connections=20, keepalive_expiry=60
+)
+# httpcore already sets TCP_NODELAY on every connection; add TCP keep-alive
+# probes so idle pooled connections dropped by a middlebox are detected
+WEREAD_SOCKET_OPTIONS = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
 
 
 class WeReadClient:
     """微信读书客户端类，用于与微信读书API交互"""
 
+    # 固定的查询参数模板，每次请求只需补充bookId
+    _READ_INFO_PARAMS = (
+        ("readingDetail", 1),
+        ("readingBookIndex", 1),
+        ("finishedDate", 1),
+    )
+    _REVIEW_LIST_PARAMS = (("listType", 11), ("mine", 1), ("syncKey", 0))
+
     def __init__(self, weread_cookie: Optional[str] = None):
         """初始化微信读书客户端
 
         Args:
             weread_cookie: 微信读书的cookie字符串（可选，如果不提供则自动获取）
         """
-        self.session = httpx.Client()
+        self.session = httpx.Client(
+            transport=httpx.HTTPTransport(
+                http2=True,
+                limits=WEREAD_CONNECTION_LIMITS,
+                socket_options=WEREAD_SOCKET_OPTIONS,
+                retries=WEREAD_CONNECT_RETRIES,
+            ),
+            timeout=WEREAD_TIMEOUT,
+        )
         self._connected = False
+        # 连接测试请求的就是笔记本列表，缓存其响应供首次get_notebooklist使用
+        self._cached_notebooklist: Optional[Dict] = None
 
         # 设置初始cookie
         if weread_cookie:
@@ -71,7 +115,7 @@ class WeReadClient:
     def _fetch(
         self,
         url: str,
-        params: Optional[Dict] = None,
+        params: Optional[Union[Dict, Sequence[Tuple[str, Any]]]] = None,
         method: str = "GET",
         log_prefix: str = "request",
         expected_keys: Optional[List[str]] = None,
@@ -89,9 +133,9 @@ class WeReadClient:
             响应的JSON数据，如果失败则返回None
         """
         try:
-            logger.info(f"Making {method} request to {url} with params: {params}")
-            response = self.session.request(method, url, params=params, timeout=10)
-            logger.info(f"Response status code: {response.status_code}")
+            logger.debug("Making %s request to %s with params: %s", method, url, params)
+            response = self._request_with_retry(method, url, params, log_prefix)
+            logger.debug("Response status code: %s", response.status_code)
 
             # 检查是否是认证错误（401, 403等）
             if response.status_code in [401, 403]:
@@ -107,8 +151,8 @@ class WeReadClient:
                 )
                 return None
 
-            response_json = response.json()
-            logger.info(f"Response: {response_json}")
+            response_json = json_loads(response.content)
+            logger.debug("Response for %s: %s", log_prefix, response_json)
 
             # Check for WeRead API error codes
             if isinstance(response_json, dict) and "errCode" in response_json:
@@ -120,13 +164,12 @@ class WeReadClient:
                     )
                     return None
 
-            # 可选的基本验证，检查期望的键是否存在
+            # 基本验证：缺少期望的键视为失败，调用方可直接按键取值
             if expected_keys and not all(key in response_json for key in expected_keys):
                 logger.warning(
                     f"Missing expected keys {expected_keys} in {log_prefix} response from {url}"
                 )
-                # 决定这是否应该是硬失败或只是警告
-                # return None # 如果缺少键应该导致失败，请取消注释
+                return None
 
             return response_json
 
@@ -140,6 +183,55 @@ class WeReadClient:
             logger.error(f"Unexpected error fetching {log_prefix}: {e}")
             return None
 
+    def _request_with_retry(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Union[Dict, Sequence[Tuple[str, Any]]]],
+        log_prefix: str,
+    ) -> httpx.Response:
+        """发送请求，遇到429/5xx时按指数退避重试
+
+        Returns:
+            最后一次请求的响应
+        """
+        for attempt in range(WEREAD_MAX_RETRIES + 1):
+            _weread_limiter.acquire()
+            response = self.session.request(method, url, params=params)
+            if (
+                response.status_code not in WEREAD_RETRYABLE_STATUS_CODES
+                or attempt == WEREAD_MAX_RETRIES
+            ):
+                return response
+
+            # 优先遵循服务端的Retry-After，否则指数退避并加入抖动
+            try:
+                retry_after = float(response.headers["Retry-After"])
+            except (KeyError, ValueError):
+                delay = min(
+                    WEREAD_RETRY_MAX_DELAY,
+                    WEREAD_RETRY_INITIAL_DELAY * 2**attempt + random.uniform(0, 0.5),
+                )
+            else:
+                # 服务端要求的等待超过上限时不再重试，提前重试只会再次被限流
+                if retry_after > WEREAD_RETRY_MAX_DELAY:
+                    logger.warning(
+                        "HTTP %s for %s, Retry-After %.1fs exceeds %.1fs; giving up",
+                        response.status_code,
+                        log_prefix,
+                        retry_after,
+                        WEREAD_RETRY_MAX_DELAY,
+                    )
+                    return response
+                delay = retry_after + random.uniform(0, 0.5)
+            logger.warning(
+                "HTTP %s for %s, retrying in %.1fs",
+                response.status_code,
+                log_prefix,
+                delay,
+            )
+            time.sleep(delay)
+
     def get_bookinfo(self, book_id: str) -> Optional[Dict]:
         """获取书籍基本信息
 
@@ -166,9 +258,7 @@ class WeReadClient:
         """
         return self._fetch(
             WEREAD_READ_PROGRESS_URL,
-            params=dict(
-                bookId=book_id, readingDetail=1, readingBookIndex=1, finishedDate=1
-            ),
+            params=(("bookId", book_id), *self._READ_INFO_PARAMS),
             log_prefix=f"{LOG_PREFIX_READ_INFO} {book_id}",
         )
 
@@ -181,11 +271,13 @@ class WeReadClient:
         Returns:
             书评列表
         """
-        return self._fetch(
+        result = self._fetch(
             WEREAD_REVIEW_LIST_URL,
-            params=dict(bookId=book_id, listType=11, mine=1, syncKey=0),
+            params=(("bookId", book_id), *self._REVIEW_LIST_PARAMS),
             log_prefix=f"{LOG_PREFIX_REVIEWS} {book_id}",
-        ).get(REVIEWS_KEY, [])
+            expected_keys=[REVIEWS_KEY],
+        )
+        return [] if result is None else result[REVIEWS_KEY]
 
     def get_bookmarks(self, book_id: str) -> List[Dict]:
         """获取书籍的书签/划线列表
@@ -196,29 +288,77 @@ class WeReadClient:
         Returns:
             书签列表
         """
+        log_prefix = f"{LOG_PREFIX_BOOKMARKS} {book_id}"
         result = self._fetch(
-            WEREAD_BOOKMARKLIST_URL,
-            params=dict(bookId=book_id),
-            log_prefix=f"{LOG_PREFIX_BOOKMARKS} {book_id}",
-            expected_keys=[UPDATED_KEY],
+            WEREAD_BOOKMARKLIST_URL, params=dict(bookId=book_id), log_prefix=log_prefix
         )
-        return result.get(UPDATED_KEY, []) if result else []
+        return self._extract_list(result, UPDATED_KEY, log_prefix)
+
+    def get_bookmarks_with_chapters(
+        self, book_id: str
+    ) -> Tuple[List[Dict], List[Dict]]:
+        """通过一次书签列表请求同时获取书签和章节信息
 
-    def get_chapters(self, book_id: str) -> Optional[List[Dict]]:
-        """获取书籍的章节信息列表
+        书签列表的响应中附带了章节信息
 
         Args:
             book_id: 书籍ID
 
         Returns:
-            章节信息列表
+            (书签列表, 章节信息列表)
         """
+        log_prefix = f"{LOG_PREFIX_BOOKMARKS} {book_id}"
         result = self._fetch(
-            WEREAD_CHAPTER_INFO,
-            params=dict(bookId=book_id),
-            log_prefix=f"{LOG_PREFIX_CHAPTER_INFO} {book_id}",
+            WEREAD_BOOKMARKLIST_URL, params=dict(bookId=book_id), log_prefix=log_prefix
         )
-        return result.get(CHAPTERS_KEY, []) if result else []
+        # 两个数组分别校验，缺少其中一个不影响另一个
+        return (
+            self._extract_list(result, UPDATED_KEY, log_prefix),
+            self._extract_list(
+                result, CHAPTERS_KEY, f"{LOG_PREFIX_CHAPTER_INFO} {book_id}"
+            ),
+        )
+
+    @staticmethod
+    def _extract_list(result: Optional[Dict], key: str, log_prefix: str) -> List[Dict]:
+        """从响应中按键取出列表，请求失败或缺少该键时视为失败并返回空列表"""
+        if result is None:
+            return []
+        if key not in result:
+            logger.warning(f"Missing expected keys {[key]} in {log_prefix} response")
+            return []
+        return result[key]
+
+    def get_book_bundle(
+        self, book_id: str, include_reviews: bool = True, include_info: bool = True
+    ) -> Dict[str, Any]:
+        """并发获取单本书所需的全部数据
+
+        Args:
+            book_id: 书籍ID
+            include_reviews: 是否同时获取书评
+            include_info: 是否获取书籍基本信息
+
+        Returns:
+            以read_info、bookmarks、chapters（以及info、reviews）为键的字典
+        """
+        fetchers = {"read_info": self.get_readinfo}
+        if include_info:
+            fetchers["info"] = self.get_bookinfo
+        # 书签列表的响应附带章节信息，一次请求即可同时取得两者
+        fetchers["bookmarks_and_chapters"] = self.get_bookmarks_with_chapters
+        if include_reviews:
+            fetchers["reviews"] = self.get_reviews
+
+        # 各请求相互独立，共享的限流器负责控制实际请求速率
+        with ThreadPoolExecutor(max_workers=len(fetchers)) as executor:
+            futures = {
+                key: executor.submit(fetch, book_id) for key, fetch in fetchers.items()
+            }
+            bundle = {key: future.result() for key, future in futures.items()}
+
+        bundle["bookmarks"], bundle["chapters"] = bundle.pop("bookmarks_and_chapters")
+        return bundle
 
     def get_notebooklist(self) -> List[Dict]:
         """获取笔记本列表（用户有做笔记的所有书籍）
@@ -226,14 +366,19 @@ class WeReadClient:
         Returns:
             按排序字段排序的书籍列表
         """
-        result = self._fetch(WEREAD_NOTEBOOKS_URL, log_prefix=LOG_PREFIX_NOTEBOOK_LIST)
+        result = self._cached_notebooklist
+        self._cached_notebooklist = None
+        if result is None:
+            result = self._fetch(
+                WEREAD_NOTEBOOKS_URL, log_prefix=LOG_PREFIX_NOTEBOOK_LIST
+            )
 
         if not result:
             return []
 
         books = result.get(BOOKS_KEY, [])
         # 按'sort'键排序，如果缺少则默认为大数字以将其放在最后
-        books.sort(key=lambda x: x.get(SORT_KEY, float("inf")))
+        books.sort(key=lambda x: x.get(SORT_KEY, _MISSING_SORT))
         return books
 
     def _try_connect(self) -> None:
@@ -248,6 +393,7 @@ class WeReadClient:
             )
             if response_data is not None:
                 self._connected = True
+                self._cached_notebooklist = response_data
                 logger.info("WeRead client connected successfully.")
             else:
                 self._connected = False